@@ -4,21 +4,46 @@ Check Point VM Automation Framework
 A Python library for automating Check Point firewall configuration and management.
 """
 
+import importlib
+
 __version__ = "0.1.0"
 __author__ = "Check Point Automation Team"
 
-from .command_executor import CommandExecutor, CommandResponse, FirewallMode
-from .config import FirewallConfig
-from .expert_password import ExpertPasswordManager
-from .script_deployment import ScriptDeployment
-from .ssh_connection import SSHConnectionManager
+# Public names are imported lazily (PEP 562) so that entry points which exit
+# early - --help, bad arguments - never pay for the netmiko/paramiko import
+# chain behind the connection modules.
+_LAZY_IMPORTS = {
+    "SSHConnectionManager": ".ssh_connection",
+    "SSHConnectionPool": ".ssh_pool",
+    "FirewallConfig": ".config",
+    "CommandExecutor": ".command_executor",
+    "CommandResponse": ".command_executor",
+    "FirewallMode": ".command_executor",
+    "ExpertPasswordManager": ".expert_password",
+    "ScriptDeployment": ".script_deployment",
+    "run_bulk": ".bulk",
+}
 
 __all__ = [
     "SSHConnectionManager",
+    "SSHConnectionPool",
     "FirewallConfig",
     "CommandExecutor",
     "CommandResponse",
     "FirewallMode",
     "ExpertPasswordManager",
     "ScriptDeployment",
+    "run_bulk",
 ]
+
+
+def __getattr__(name: str):
+    """Resolve public names on first access and cache them on the package."""
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    attr = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = attr
+    return attr
@@ -0,0 +1,6 @@
+"""Allow running the CLI as `python -m checkpoint_utils`."""
+
+from .cli import main
+
+if __name__ == "__main__":
+    main()
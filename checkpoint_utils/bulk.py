@@ -0,0 +1,56 @@
+"""Concurrent fan-out of tasks across multiple firewalls.
+
+Each host still runs its own workflow sequentially (connect, configure,
+verify), but hosts overlap: for N firewalls with per-host latency T, wall
+time drops from roughly N*T to ~T, bounded by the worker limit.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Sequence
+
+from .config import FirewallConfig
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on simultaneous SSH sessions; per-host work is network-bound,
+# so threads spend almost all their time waiting on the channel
+DEFAULT_CONCURRENCY = 32
+
+
+def run_bulk(
+    task: Callable[[FirewallConfig], bool],
+    configs: Sequence[FirewallConfig],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Dict[str, bool]:
+    """Run a task function against many firewalls concurrently.
+
+    Args:
+        task: Task callable taking a FirewallConfig and returning success,
+            e.g. tasks.task_set_expert_password
+        configs: One FirewallConfig per target firewall
+        concurrency: Maximum number of hosts worked on at once
+
+    Returns:
+        Dict mapping each firewall's IP address to its task result
+    """
+    results: Dict[str, bool] = {}
+    if not configs:
+        return results
+
+    workers = min(concurrency, len(configs))
+    logger.info(f"Running {task.__name__} on {len(configs)} firewalls with {workers} workers")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(task, config): config for config in configs}
+        for future in as_completed(futures):
+            config = futures[future]
+            try:
+                results[config.ip_address] = future.result()
+            except Exception as e:
+                logger.error(f"Task failed on {config.ip_address}: {e}")
+                results[config.ip_address] = False
+
+    succeeded = sum(results.values())
+    logger.info(f"Bulk run complete: {succeeded}/{len(results)} firewalls succeeded")
+    return results
@@ -7,14 +7,37 @@ Command-line interface for CheckPoint firewall management tasks.
 import argparse
 import logging
 import sys
+from functools import lru_cache
 from typing import List
 
 from .config import FirewallConfig
-from .tasks import (
-    task_copy_binary,
-    task_create_vagrant_user,
-    task_set_expert_password,
-)
+
+# Banner separators, built once at import instead of re-multiplied per print
+_EQ70 = "=" * 70
+_DASH50 = "-" * 50
+
+
+@lru_cache(maxsize=1)
+def _task_functions():
+    """Build the task dispatch table on first use.
+
+    The tasks module drags in the netmiko/paramiko import chain, so it is
+    imported here rather than at module top - --help and argument-error
+    exits stay fast, and the table is still built only once per process.
+    """
+    # Deliberately function-level: importing tasks at module top would pull
+    # netmiko/paramiko into every --help invocation
+    from .tasks import (  # noqa: PLC0415
+        task_copy_binary,
+        task_create_vagrant_user,
+        task_set_expert_password,
+    )
+
+    return {
+        1: ("Set Expert Password", task_set_expert_password),
+        2: ("Configure Vagrant User", task_create_vagrant_user),
+        3: ("Copy Binary Files", task_copy_binary),
+    }
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
@@ -123,31 +146,28 @@ def run_tasks(config: FirewallConfig, task_list: List[int]) -> bool:
     Returns:
         True if all tasks succeeded, False otherwise
     """
-    print("\n" + "=" * 70)
+    print("\n" + _EQ70)
     print("🚀 CheckPoint Firewall Management Tool")
-    print("=" * 70)
+    print(_EQ70)
     print(f"Target: {config.ip_address}")
     print(f"Tasks to run: {', '.join(map(str, task_list))}")
-    print("=" * 70)
-
-    task_functions = {
-        1: ("Set Expert Password", task_set_expert_password),
-        2: ("Configure Vagrant User", task_create_vagrant_user),
-        3: ("Copy Binary Files", task_copy_binary),
-    }
+    print(_EQ70)
 
+    task_functions = _task_functions()
     results = []
 
     for task_num in task_list:
-        if task_num not in task_functions:
+        # Single dict lookup on the normal path instead of a membership
+        # test followed by a second lookup
+        try:
+            task_name, task_func = task_functions[task_num]
+        except KeyError:
             print(f"\n❌ Unknown task number: {task_num}")
             results.append(False)
             continue
 
-        task_name, task_func = task_functions[task_num]
-
         print(f"\n🎯 Starting Task {task_num}: {task_name}")
-        print("-" * 50)
+        print(_DASH50)
 
         try:
             success = task_func(config)
@@ -163,26 +183,30 @@ def run_tasks(config: FirewallConfig, task_list: List[int]) -> bool:
             logging.exception(f"Task {task_num} execution failed")
             results.append(False)
 
-    # Print summary
-    print("\n" + "=" * 70)
-    print("📝 EXECUTION SUMMARY")
-    print("=" * 70)
+    # Build the summary as one string and emit it with a single print -
+    # one write and one interpreter round trip instead of a print per task
+    lines = ["\n" + _EQ70, "📝 EXECUTION SUMMARY", _EQ70]
 
     for i, task_num in enumerate(task_list):
-        task_name = task_functions[task_num][0] if task_num in task_functions else f"Unknown Task {task_num}"
+        try:
+            task_name = task_functions[task_num][0]
+        except KeyError:
+            task_name = f"Unknown Task {task_num}"
         status = "✅ SUCCESS" if results[i] else "❌ FAILED"
-        print(f"Task {task_num}: {task_name} - {status}")
+        lines.append(f"Task {task_num}: {task_name} - {status}")
 
     total_success = sum(results)
     total_tasks = len(task_list)
-    print(f"\nOverall: {total_success}/{total_tasks} tasks completed successfully")
+    lines.append(f"\nOverall: {total_success}/{total_tasks} tasks completed successfully")
 
-    if all(results):
-        print("🎉 All tasks completed successfully!")
-        return True
+    all_success = all(results)
+    if all_success:
+        lines.append("🎉 All tasks completed successfully!")
     else:
-        print("⚠️  Some tasks failed - check the output above for details.")
-        return False
+        lines.append("⚠️  Some tasks failed - check the output above for details.")
+
+    print("\n".join(lines))
+    return all_success
 
 
 def main() -> None:
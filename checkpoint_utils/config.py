@@ -1,15 +1,46 @@
 """Configuration management for Check Point automation."""
 
+import re
 from dataclasses import dataclass
 from typing import Optional
 
 # Constants
 MIN_PASSWORD_LENGTH = 6
 
+# Character-class patterns for password strength checks, compiled once at
+# import so repeated validations (bulk runs, retries) skip recompilation
+_PW_UPPER_RE = re.compile(r"[A-Z]")
+_PW_LOWER_RE = re.compile(r"[a-z]")
+_PW_DIGIT_RE = re.compile(r"\d")
 
-@dataclass
+
+def validate_password_strength(password: str) -> bool:
+    """Check whether a password mixes upper, lower and digit characters.
+
+    Length is checked first so too-short passwords fail without touching
+    the regexes. Advisory only - callers enforce MIN_PASSWORD_LENGTH as the
+    hard requirement and use this to warn about weak composition.
+
+    Args:
+        password: Password to check
+
+    Returns:
+        True if the password meets the length and character-class mix
+    """
+    if len(password) < MIN_PASSWORD_LENGTH:
+        return False
+    return bool(
+        _PW_UPPER_RE.search(password) and _PW_LOWER_RE.search(password) and _PW_DIGIT_RE.search(password)
+    )
+
+
+@dataclass(frozen=True, slots=True)
 class FirewallConfig:
-    """Configuration class for firewall connection details."""
+    """Configuration class for firewall connection details.
+
+    Frozen so instances are hashable (usable directly as connection-pool
+    keys) and slotted so attribute access skips the per-instance dict.
+    """
 
     ip_address: str
     # Required fields - defaults are provided by caller
@@ -1,12 +1,25 @@
 r"""Expert password management for Check Point firewalls using netmiko."""
 
+import re
 import time
-from typing import Tuple
+from typing import Sequence, Tuple
 
 from .command_executor import FirewallMode
-from .config import MIN_PASSWORD_LENGTH
+from .config import MIN_PASSWORD_LENGTH, validate_password_strength
+from .prompts import ERROR_RE, EXPERT_PW_PROMPT_RE
 from .ssh_connection import SSHConnectionManager
 
+# Prompt/response classification patterns, compiled once at import so hot
+# paths avoid lowercasing multi-KB command outputs on every check
+_EXPERT_PW_UNSET_RE = re.compile(r"expert password has not been defined", re.IGNORECASE)
+_CURRENT_PW_PROMPT_RE = re.compile(r"enter current expert password:", re.IGNORECASE)
+_NEW_PW_PROMPT_RE = re.compile(r"enter new expert password:", re.IGNORECASE)
+
+# (read_timeout, pause) pairs tried in order when acquiring the database
+# lock: fail fast on the first attempts, wait longer on the later ones so
+# transiently contended databases still succeed
+_LOCK_RETRY_TIMING = ((5, 0.5), (10, 1.0), (30, 2.0))
+
 
 class ExpertPasswordManager:
     """Simple expert password manager using only netmiko methods."""
@@ -16,6 +29,42 @@ class ExpertPasswordManager:
         self.ssh = ssh_manager
         self.logger = ssh_manager.logger
 
+    def _lock_database(self, timing_configuration: Sequence[Tuple[int, float]] = _LOCK_RETRY_TIMING) -> bool:
+        """Acquire the configuration database lock with retry and backoff.
+
+        Each (read_timeout, pause) pair is tried in order: run
+        'lock database override' with that timeout and, if it fails, wait
+        pause seconds before the next attempt. Fails soft - callers carry on
+        without the lock as before - but a transiently held lock is now
+        retried instead of warned about immediately.
+
+        Args:
+            timing_configuration: (read_timeout, pause) pairs tried in order
+
+        Returns:
+            True if the lock was acquired
+        """
+        for attempt, (read_timeout, pause) in enumerate(timing_configuration, start=1):
+            try:
+                output = self.ssh.connection.send_command_timing(
+                    "lock database override",
+                    last_read=self.ssh.config.last_read,
+                    read_timeout=read_timeout,
+                )
+                if not ERROR_RE.search(output):
+                    self.logger.debug("Database lock acquired")
+                    return True
+                self.logger.debug("Database lock attempt failed: %s", output.strip())
+            except Exception as e:
+                self.logger.debug(f"Database lock command failed: {e}")
+            # Pause only between attempts - nothing retries after the last
+            # one, so sleeping there would just delay the soft-fail
+            if attempt < len(timing_configuration):
+                time.sleep(pause)
+
+        self.logger.warning("Could not acquire database lock, continuing anyway")
+        return False
+
     def is_expert_password_set(self) -> Tuple[bool, str]:
         """Check if expert password is already set.
 
@@ -36,19 +85,19 @@ class ExpertPasswordManager:
                 read_timeout=self.ssh.config.read_timeout,
             )
 
-            if "enter expert password:" in output.lower():
+            if EXPERT_PW_PROMPT_RE.search(output):
                 message = "Expert password is already set"
                 self.logger.info(message)
                 # Cancel the password prompt with Ctrl+C
                 self.ssh.connection.write_channel("\x03\n")
                 return True, message
-            elif "expert password has not been defined" in output.lower():
+            elif _EXPERT_PW_UNSET_RE.search(output):
                 message = "Expert password is not set"
                 self.logger.info(message)
                 return False, message
             else:
                 # Might already be in expert mode or other state
-                self.logger.debug(f"Unexpected expert command output: {output}")
+                self.logger.debug("Unexpected expert command output: %s", output)
                 return False, "Could not determine expert password status"
 
         except Exception as e:
@@ -71,64 +120,49 @@ class ExpertPasswordManager:
             self.logger.error(f"Password must be at least {MIN_PASSWORD_LENGTH} characters")
             return False
 
+        if not validate_password_strength(password):
+            self.logger.warning("Expert password does not mix upper/lower/digit characters")
+
         # Make sure we're in clish mode
         if self.ssh.get_current_mode() == FirewallMode.EXPERT:
             self.ssh.exit_expert_mode()
 
         try:
-            # Step 1: Lock database
+            # Step 1: Lock database (retry with backoff on contention)
             self.logger.debug("Locking database")
-            try:
-                output_lock = self.ssh.connection.send_command_timing(
-                    "lock database override",
-                    last_read=self.ssh.config.last_read,
-                    read_timeout=self.ssh.config.read_timeout,
-                )
-                if "error" not in output_lock.lower():
-                    self.logger.debug("Database lock acquired")
-                else:
-                    self.logger.warning("Database lock failed, continuing anyway")
-            except Exception as e:
-                self.logger.warning(f"Database lock command failed: {e}, continuing anyway")
+            self._lock_database()
 
-            # Step 2: Start password setup using write_channel approach
+            # Step 2: Start password setup and wait for whichever prompt
+            # (or an error/return to the shell prompt) comes back
             self.logger.debug("Starting set expert-password")
-
-            self.ssh.connection.write_channel("set expert-password\n")
-            time.sleep(0.5)
-            output = self.ssh.connection.read_channel()
+            output = self.ssh.run_dialog([("set expert-password\n", r"(?i)password:|[>#]\s*$")])
 
             # Check if we're being asked for current password (means password already exists)
-            if "enter current expert password:" in output.lower():
+            if _CURRENT_PW_PROMPT_RE.search(output):
                 self.logger.warning("Expert password is already set")
                 # Send Ctrl+C to abort
                 self.ssh.connection.write_channel("\x03\n")
                 return False
 
             # Check if we get the "Enter new expert password:" prompt (password not set)
-            if "enter new expert password:" in output.lower():
+            if _NEW_PW_PROMPT_RE.search(output):
                 self.logger.debug("Got 'Enter new expert password' prompt - proceeding")
 
-                # Step 3: Send first password
-                self.logger.debug("Sending first password")
-                self.ssh.connection.write_channel(f"{password}\n")
-                time.sleep(0.5)
-
-                # Step 4: Send confirmation password
-                self.logger.debug("Sending confirmation password")
-                self.ssh.connection.write_channel(f"{password}\n")
-                time.sleep(1)
-
-                # Read final output
-                final_output = self.ssh.connection.read_channel()
-                output += final_output
+                # Steps 3-4: Drive the password/confirmation dialog - each
+                # secret is sent the moment its prompt appears, no sleeps
+                output += self.ssh.run_dialog(
+                    [
+                        (f"{password}\n", r"(?i)password.*:"),
+                        (f"{password}\n", r"[>#]\s*$"),
+                    ]
+                )
             else:
-                self.logger.error(f"Unexpected response to set expert-password: {output}")
+                self.logger.error("Unexpected response to set expert-password: %s", output)
                 return False
 
             # Step 5: Check result
-            if "error" in output.lower() or "failed" in output.lower():
-                self.logger.error(f"Password setup failed: {output}")
+            if ERROR_RE.search(output):
+                self.logger.error("Password setup failed: %s", output)
                 return False
 
             self.logger.info("Expert password set successfully")
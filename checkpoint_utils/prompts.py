@@ -0,0 +1,30 @@
+"""Shared prompt and error patterns for Check Point shells.
+
+Compiled once at import and reused across the connection, password and
+user-management modules, so the hot prompt-parsing paths never recompile a
+pattern (or lowercase a whole transcript) per call.
+"""
+
+import re
+
+# Shell prompts: expert mode ('[Expert@host:0]#') and Gaia clish ('hostname>')
+EXPERT_PROMPT_RE = re.compile(r"\[Expert@[^\]]+\]#")
+CLISH_PROMPT_RE = re.compile(r">\s*$")
+
+# Either shell prompt at end of output - used when waiting for a command
+# to land without caring which mode answered
+ANY_PROMPT_RE = re.compile(r"[>#]\s*$")
+
+# Interactive password prompt, mode-independent
+PASSWORD_PROMPT_RE = re.compile(r"password:", re.IGNORECASE)
+
+# Prompt shown by the 'expert' command when a password is already set
+EXPERT_PW_PROMPT_RE = re.compile(r"enter expert password:", re.IGNORECASE)
+
+# Generic failure markers in command output
+ERROR_RE = re.compile(r"error|failed", re.IGNORECASE)
+
+# Exit-status marker appended as 'echo RC:$?' when a command runs over a
+# prompt-driven channel; $? expands remotely, so the echoed command line
+# (which shows the literal $?) can never false-match
+RC_MARKER_RE = re.compile(r"RC:(\d+)")
@@ -11,6 +11,14 @@ from typing import Optional, Tuple
 from .command_executor import FirewallMode
 from .ssh_connection import SSHConnectionManager
 
+# Scripts up to this size are piped straight into bash instead of being
+# written to the remote filesystem first
+MAX_INLINE_SCRIPT_SIZE = 64 * 1024
+
+# Chunk size for streamed SFTP uploads - large enough that the transfer is
+# bounded by the SSH window, not by Python-level write calls
+SFTP_CHUNK_SIZE = 1024 * 1024
+
 
 class ScriptDeployment:
     """Simple script deployment using netmiko methods."""
@@ -20,6 +28,109 @@ class ScriptDeployment:
         self.ssh = ssh_manager
         self.logger = ssh_manager.logger
 
+    def run_script_content(self, script_content: str) -> Tuple[bool, str]:
+        """Execute a small script inline without a remote file round trip.
+
+        Encodes the script as base64 and pipes it straight into bash,
+        skipping the deploy-file, chmod and execute steps entirely. Runs
+        over a single exec channel where the connecting user's login shell
+        allows it, or the interactive expert-mode fallback on stock Gaia
+        admin accounts (see SSHConnectionManager.run_shell). Fails with an
+        error for scripts larger than MAX_INLINE_SCRIPT_SIZE - deploy those
+        as files instead.
+
+        Args:
+            script_content: Script text to execute
+
+        Returns:
+            Tuple of (success, output)
+        """
+        script_bytes = script_content.encode("utf-8")
+        if len(script_bytes) > MAX_INLINE_SCRIPT_SIZE:
+            return False, f"Script too large for inline execution ({len(script_bytes)} bytes)"
+
+        self.logger.info("Executing script content inline via base64 pipe")
+
+        try:
+            encoded = base64.b64encode(script_bytes).decode("ascii")
+            exit_status, output = self.ssh.run_shell(f"echo {encoded} | base64 -d | bash -s")
+
+            if exit_status == 0:
+                self.logger.info("Inline script executed successfully")
+                return True, output
+
+            return False, f"Inline script failed with exit status {exit_status}: {output}"
+
+        except Exception as e:
+            error_msg = f"Error executing inline script: {str(e)}"
+            self.logger.error(error_msg)
+            return False, error_msg
+
+    def deploy_file_sftp(self, local_file_path: str, remote_file_path: str) -> Tuple[bool, str]:
+        """Deploy a file over the shared SFTP session as one streamed transfer.
+
+        Unlike the heredoc paths, the content travels over the connection's
+        cached SFTP channel in a single stream - no per-line shell round
+        trips, no expert-mode requirement, and binary-safe. Requires the
+        connecting user's login shell to be a POSIX shell (e.g. /bin/bash):
+        Gaia spawns the sftp subsystem through the login shell, so SFTP is
+        unavailable to clish-shell accounts and this method fails fast with
+        a clear message there - use the heredoc deploys instead. Writes are
+        pipelined so chunks are sent back to back without waiting for each
+        server ACK, keeping the transfer wire-speed over high-RTT links. The
+        result is verified with a single sftp.stat() instead of a separate
+        ls round trip.
+
+        Args:
+            local_file_path: Path to local file
+            remote_file_path: Path where file should be created on firewall
+
+        Returns:
+            Tuple of (success, message)
+        """
+        try:
+            file_size = os.stat(local_file_path).st_size
+        except OSError:
+            return False, f"Local file not found: {local_file_path}"
+
+        # Gaia spawns the sftp subsystem through the login shell; a clish
+        # account cannot serve SFTP, so fail with guidance instead of an
+        # opaque channel error
+        if not self.ssh.has_exec_shell():
+            return False, (
+                "SFTP unavailable: the connecting user's login shell is clish, "
+                "not a POSIX shell - use deploy_text_file/deploy_binary_file instead"
+            )
+
+        self.logger.info(f"Deploying {local_file_path} ({file_size} bytes) to {remote_file_path} via SFTP")
+
+        try:
+            sftp = self.ssh.get_sftp()
+            with open(local_file_path, "rb") as src, sftp.open(remote_file_path, "wb") as dst:
+                # Pipelined mode skips the per-write status wait; errors
+                # surface on the next write or on close instead
+                dst.set_pipelined(True)
+                # Pre-size the remote file so each chunk fills data instead
+                # of growing the file's metadata write by write
+                dst.truncate(file_size)
+                while True:
+                    chunk = src.read(SFTP_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+
+            attrs = sftp.stat(remote_file_path)
+            if attrs.st_size != file_size:
+                return False, f"Size mismatch after upload: local {file_size}, remote {attrs.st_size}"
+
+            self.logger.info(f"File deployed successfully to {remote_file_path}")
+            return True, "File deployed successfully"
+
+        except Exception as e:
+            error_msg = f"Error deploying file via SFTP: {str(e)}"
+            self.logger.error(error_msg)
+            return False, error_msg
+
     def deploy_text_file(self, local_file_path: str, remote_file_path: str) -> Tuple[bool, str]:
         """Deploy a text file using cat with EOF delimiter.
 
@@ -30,12 +141,14 @@ class ScriptDeployment:
         Returns:
             Tuple of (success, message)
         """
-        self.logger.info(f"Deploying text file {local_file_path} to {remote_file_path}")
-
-        # Check if local file exists
-        if not os.path.isfile(local_file_path):
+        # Stat once - existence check and size in a single syscall
+        try:
+            file_size = os.stat(local_file_path).st_size
+        except OSError:
             return False, f"Local file not found: {local_file_path}"
 
+        self.logger.info(f"Deploying text file {local_file_path} ({file_size} bytes) to {remote_file_path}")
+
         # Make sure we're in expert mode for file operations
         if self.ssh.get_current_mode() != FirewallMode.EXPERT:
             self.logger.error("Must be in expert mode for file deployment")
@@ -60,23 +173,25 @@ class ScriptDeployment:
             self.logger.debug("Sending file content")
             self.ssh.connection.write_channel(file_content)
 
-            # Close the heredoc
-            self.logger.debug("Closing heredoc")
-            self.ssh.connection.write_channel(f"\n{eof_delimiter}\n")
-
-            # Wait a moment for command to complete
-            time.sleep(1)
-
-            # Verify file was created
-            try:
-                output = self.ssh.connection.send_command(f"ls -la {remote_file_path}")
-                if remote_file_path in output:
-                    self.logger.info(f"File deployed successfully to {remote_file_path}")
-                    return True, "File deployed successfully"
-                else:
-                    return False, "File deployment verification failed"
-            except Exception as e:
-                return False, f"File deployment verification failed: {str(e)}"
+            # Close the heredoc and verify in the same write - the ls and
+            # its exit code ride the read that was already needed for the
+            # heredoc, saving a separate verification round trip. $? expands
+            # remotely, so the echoed command line cannot fake the RC:0.
+            self.logger.debug("Closing heredoc and verifying")
+            self.ssh.connection.write_channel(f"\n{eof_delimiter}\nls -la {remote_file_path}; echo RC:$?\n")
+
+            # Wait for the marker itself rather than an idle heuristic - a
+            # slow link or a large heredoc echo can outlast any fixed idle
+            # ceiling, and an unread marker would corrupt the next command's
+            # parse. The digits only exist in the remote expansion, so the
+            # echoed command line cannot match early.
+            output = self.ssh.connection.read_until_pattern(
+                pattern=r"RC:\d+", read_timeout=self.ssh.config.timeout
+            )
+            if "RC:0" in output:
+                self.logger.info(f"File deployed successfully to {remote_file_path}")
+                return True, "File deployed successfully"
+            return False, f"File deployment verification failed: {output.strip()}"
 
         except Exception as e:
             error_msg = f"Error deploying file: {str(e)}"
@@ -93,12 +208,14 @@ class ScriptDeployment:
         Returns:
             Tuple of (success, message)
         """
-        self.logger.info(f"Deploying binary file {local_file_path} to {remote_file_path}")
-
-        # Check if local file exists
-        if not os.path.isfile(local_file_path):
+        # Stat once - existence check and size in a single syscall
+        try:
+            file_size = os.stat(local_file_path).st_size
+        except OSError:
             return False, f"Local file not found: {local_file_path}"
 
+        self.logger.info(f"Deploying binary file {local_file_path} ({file_size} bytes) to {remote_file_path}")
+
         # Make sure we're in expert mode
         if self.ssh.get_current_mode() != FirewallMode.EXPERT:
             self.logger.error("Must be in expert mode for file deployment")
@@ -119,29 +236,43 @@ class ScriptDeployment:
             if not success:
                 return False, f"Failed to deploy base64 data: {message}"
 
-            # Decode the base64 file to binary
-            decode_cmd = f"base64 -d {temp_b64_file} > {remote_file_path}"
-            try:
-                self.ssh.connection.send_command(decode_cmd)
-            except Exception as e:
-                return False, f"Failed to decode base64 file: {str(e)}"
-
-            # Clean up temporary file
-            try:
-                self.ssh.connection.send_command(f"rm -f {temp_b64_file}")
-            except Exception as e:
-                self.logger.warning(f"Failed to clean up temporary file {temp_b64_file}: {str(e)}")
-
-            # Verify binary file
-            try:
-                output = self.ssh.connection.send_command(f"ls -la {remote_file_path}")
-                if remote_file_path in output:
-                    self.logger.info(f"Binary file deployed successfully to {remote_file_path}")
-                    return True, "Binary file deployed successfully"
-                else:
+            # Decode and clean up in one shell round trip instead of two
+            # prompt-driven commands; set -e aborts on the first failure so
+            # the exit status attributes it. run_shell stays on the
+            # interactive expert channel (already entered above) when the
+            # login shell cannot serve exec requests.
+            exit_status, output = self.ssh.run_shell(
+                f"set -e; base64 -d {temp_b64_file} > {remote_file_path}; rm -f {temp_b64_file}"
+            )
+            if exit_status != 0:
+                return False, f"Failed to decode base64 file: {output.strip()}"
+
+            if self.ssh.has_exec_shell():
+                # Verify over SFTP - one binary stat packet, no shell fork
+                # and no ls output parsing
+                try:
+                    attrs = self.ssh.get_sftp().stat(remote_file_path)
+                except IOError:
                     return False, "Binary file deployment verification failed"
-            except Exception as e:
-                return False, f"Binary file deployment verification failed: {str(e)}"
+
+                self.logger.info(
+                    f"Binary file deployed successfully to {remote_file_path} ({attrs.st_size} bytes)"
+                )
+                # Surface the stat facts in the message so callers do not
+                # need a follow-up ls round trip to confirm the result
+                return True, (
+                    f"Binary file deployed successfully: {remote_file_path} "
+                    f"mode={oct(attrs.st_mode)} size={attrs.st_size} mtime={attrs.st_mtime}"
+                )
+
+            # No sftp subsystem for clish-shell accounts - verify over the
+            # interactive channel instead
+            exit_status, output = self.ssh.run_shell(f"ls -la {remote_file_path}")
+            if exit_status != 0:
+                return False, f"Binary file deployment verification failed: {output.strip()}"
+
+            self.logger.info(f"Binary file deployed successfully to {remote_file_path}")
+            return True, "Binary file deployed successfully"
 
         except Exception as e:
             error_msg = f"Error deploying binary file: {str(e)}"
@@ -174,8 +305,9 @@ class ScriptDeployment:
             # Close the heredoc
             self.ssh.connection.write_channel(f"\n{eof_delimiter}\n")
 
-            # Wait for command to complete
-            time.sleep(1)
+            # Drain until the channel goes quiet instead of a fixed sleep -
+            # returns as soon as the shell has swallowed the heredoc
+            self.ssh.read_until_idle()
 
             return True, "Content deployed successfully"
 
@@ -185,6 +317,11 @@ class ScriptDeployment:
     def execute_script(self, script_path: str, args: Optional[str] = None) -> Tuple[bool, str]:
         """Execute a script on the firewall.
 
+        The chmod and the script run together as one shell command - over a
+        dedicated exec channel where the login shell allows it, with the
+        exit status coming straight from the script, or via the expert-mode
+        interactive fallback on stock Gaia admin accounts.
+
         Args:
             script_path: Path to script on firewall
             args: Optional arguments for the script
@@ -194,30 +331,19 @@ class ScriptDeployment:
         """
         self.logger.info(f"Executing script: {script_path}")
 
-        # Make sure we're in expert mode
-        if self.ssh.get_current_mode() != FirewallMode.EXPERT:
-            self.logger.error("Must be in expert mode to execute scripts")
-            return False, "Must be in expert mode to execute scripts"
+        script_command = script_path
+        if args:
+            script_command += f" {args}"
 
         try:
-            # Make script executable
-            chmod_response = self.ssh.execute_command(f"chmod +x {script_path}")
-            if not chmod_response.success:
-                self.logger.warning(f"Failed to make script executable: {chmod_response.error_message}")
-
-            # Execute the script
-            script_command = script_path
-            if args:
-                script_command += f" {args}"
-
             self.logger.debug(f"Executing: {script_command}")
-            response = self.ssh.execute_command(script_command, timeout=60)
+            exit_status, output = self.ssh.run_shell(f"chmod +x {script_path} && {script_command}", timeout=60)
 
-            if response.success:
+            if exit_status == 0:
                 self.logger.info("Script executed successfully")
-                return True, response.output
-            else:
-                return False, response.error_message or "Script execution failed"
+                return True, output
+
+            return False, f"Script execution failed with exit status {exit_status}: {output}"
 
         except Exception as e:
             error_msg = f"Error executing script: {str(e)}"
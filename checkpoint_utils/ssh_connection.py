@@ -1,11 +1,21 @@
 """Simplified SSH Connection Manager for Check Point firewalls using netmiko."""
 
+import atexit
+import contextlib
 import logging
 import os
+import queue
+import random
+import re
+import selectors
+import shlex
+import socket
 import time
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Callable, List, Optional, Sequence, Tuple
 
+import paramiko
 from netmiko import (
     ConnectHandler,
     NetMikoAuthenticationException,
@@ -15,6 +25,30 @@ from netmiko.exceptions import NetmikoBaseException
 
 from .command_executor import FirewallMode
 from .config import FirewallConfig
+from .prompts import CLISH_PROMPT_RE, EXPERT_PROMPT_RE, EXPERT_PW_PROMPT_RE, RC_MARKER_RE
+
+# Prefer AEAD ciphers with hardware-accelerated implementations (AES-NI /
+# vectorized chacha20) for bulk transfers. Cipher negotiation happens inside
+# netmiko before we can touch the transport, so reorder paramiko's
+# class-level preference once at import; only ciphers paramiko already
+# supports are promoted, so negotiation cannot break.
+try:
+    _FAST_CIPHERS = tuple(
+        c
+        for c in ("aes128-gcm@openssh.com", "chacha20-poly1305@openssh.com")
+        if c in paramiko.Transport._preferred_ciphers
+    )
+    paramiko.Transport._preferred_ciphers = _FAST_CIPHERS + tuple(
+        c for c in paramiko.Transport._preferred_ciphers if c not in _FAST_CIPHERS
+    )
+except Exception:  # private attribute - layout may change between versions
+    pass
+
+
+# Commands that move the session between clish and expert; when one goes
+# over the channel through a generic helper, the locally tracked mode can
+# no longer be trusted and is re-detected on the next read
+_MODE_CHANGING_RE = re.compile(r"^\s*(expert|exit)\s*$", re.MULTILINE)
 
 
 class SSHConnectionManager:
@@ -30,6 +64,17 @@ class SSHConnectionManager:
         self.connection: Optional[ConnectHandler] = None
         self.logger = self._setup_logging()
         self.current_mode = FirewallMode.UNKNOWN
+        self._sftp: Optional[paramiko.SFTPClient] = None
+        # Whether exec channels get a POSIX shell for this user - probed
+        # lazily per connection by has_exec_shell()
+        self._exec_shell: Optional[bool] = None
+        # Last prompt seen on the channel - lets callers classify the mode
+        # without issuing another round trip
+        self._last_prompt = ""
+        # Handshake facts captured during connect() so liveness/sanity
+        # checks can read them instead of issuing a probe command
+        self.server_banner = ""
+        self.initial_prompt = ""
 
         # Device parameters for netmiko - only include valid ConnectHandler parameters
         self.device_params = {
@@ -39,10 +84,33 @@ class SSHConnectionManager:
             "password": self.config.password,
             "timeout": self.config.timeout,
             "session_timeout": self.config.timeout,
+            # Protocol-level keepalives so idle pooled connections are not
+            # silently dropped by firewalls/NAT between tasks
+            "keepalive": 30,
         }
 
+        # Persistent host-key cache: paramiko's auto-add policy saves each
+        # server key into the loaded file on first contact, so repeat
+        # connections verify against the cache instead of re-learning the
+        # key (and flag an unexpected key change)
+        host_keys_file = os.path.expanduser("~/.cache/checkpoint_automation/known_hosts")
+        try:
+            os.makedirs(os.path.dirname(host_keys_file), exist_ok=True)
+            # Append mode creates the file if missing - one open instead of
+            # a separate existence stat plus open
+            open(host_keys_file, "a").close()
+            self.device_params.update({"alt_host_keys": True, "alt_key_file": host_keys_file})
+        except OSError as e:
+            self.logger.debug(f"Host key cache unavailable: {e}")
+
     def _setup_logging(self) -> logging.Logger:
-        """Set up simplified logging configuration."""
+        """Set up simplified logging configuration.
+
+        The logger gets a single QueueHandler; formatting and the actual
+        file/console writes happen on a QueueListener background thread, so
+        log calls on the SSH read/write path cost one queue put instead of
+        two synchronous writes.
+        """
         logger = logging.getLogger(f"checkpoint_utils.ssh.{self.config.ip_address}")
 
         # Prevent propagation to root logger to avoid double logging
@@ -56,11 +124,14 @@ class SSHConnectionManager:
 
             log_file = os.path.join(logs_dir, f"checkpoint_{self.config.ip_address.replace('.', '_')}.log")
 
-            # Use standard rotating file handler (simpler than custom compressed version)
+            # Use standard rotating file handler (simpler than custom
+            # compressed version); delay=True defers opening the file until
+            # the first record actually reaches it
             file_handler = RotatingFileHandler(
                 log_file,
                 maxBytes=1 * 1024 * 1024,  # 1MB
                 backupCount=5,
+                delay=True,
             )
 
             # Set up console handler for important messages
@@ -72,11 +143,23 @@ class SSHConnectionManager:
             file_handler.setFormatter(formatter)
             console_handler.setFormatter(formatter)
 
-            # Add handlers to logger
-            logger.addHandler(file_handler)
-            logger.addHandler(console_handler)
+            # Hot path only enqueues the record; the listener thread does
+            # the formatting and I/O. Flushed and stopped at interpreter
+            # exit so no records are lost.
+            log_queue = queue.Queue(-1)
+            logger.addHandler(QueueHandler(log_queue))
             logger.setLevel(logging.DEBUG)  # File gets all messages, console filtered above
 
+            listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+
+            # Cap third-party SSH-stack chatter: paramiko logs every packet
+            # exchange at DEBUG, which floods the handlers (and serializes
+            # with the channel read loop) whenever callers run at DEBUG
+            for noisy in ("paramiko", "paramiko.transport", "netmiko"):
+                logging.getLogger(noisy).setLevel(logging.WARNING)
+
         return logger
 
     def connect(self, timeout: Optional[int] = None) -> bool:
@@ -105,14 +188,41 @@ class SSHConnectionManager:
             # Create netmiko connection
             self.connection = ConnectHandler(**self.device_params)
 
+            # Tune the underlying transport for throughput and latency
+            self._tune_transport()
+
+            # Fresh connection, fresh shell - re-probe on next use
+            self._exec_shell = None
+
             # Detect initial mode
             self.current_mode = self._detect_current_mode()
 
+            # Cache what the handshake already told us: the server's version
+            # banner and the first prompt. Callers wanting a cheap "does the
+            # shell work" check can read these instead of sending a command.
+            try:
+                self.server_banner = self.connection.remote_conn.get_transport().remote_version
+            except Exception:
+                self.server_banner = ""
+            self.initial_prompt = self._last_prompt
+
             self.logger.info(f"Successfully connected to {self.config.ip_address}")
             self.logger.info(f"Initial firewall mode detected: {self.current_mode.value}")
 
             return True
 
+        except paramiko.BadHostKeyException:
+            # A re-imaged firewall (the tool's core first-time-wizard
+            # workflow) presents a new key at the same address; prune the
+            # stale cache entry so the next connect() re-learns it instead
+            # of failing until the file is hand-edited
+            self.logger.error(
+                f"Host key for {self.config.ip_address} changed - likely re-imaged. "
+                f"Removing the stale entry from the host-key cache; retry to reconnect."
+            )
+            self._prune_host_key()
+            self.disconnect()
+            return False
         except (
             NetMikoAuthenticationException,
             NetMikoTimeoutException,
@@ -126,16 +236,105 @@ class SSHConnectionManager:
             self.disconnect()
             return False
 
+    def _tune_transport(self) -> None:
+        """Tune the underlying paramiko transport for faster transfers.
+
+        Raises the default window/packet sizes used by channels opened later
+        (exec/SFTP uploads open fully instead of trickling 32KB at a time)
+        and sets TCP_NODELAY so small interactive writes are not delayed by
+        Nagle's algorithm. TCP keepalives back up the SSH-level keepalive so
+        an idle session (or a dead peer) is detected at the socket level too,
+        instead of stalling until the OS retransmission timeout.
+        """
+        try:
+            transport = self.connection.remote_conn.get_transport()
+            transport.default_window_size = 2**27
+            transport.default_max_packet_size = 2**19
+            transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            transport.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            # Probe after 30s idle, then every 10s, declaring the peer dead
+            # after 3 missed probes (Linux-specific knobs, hence the guard)
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+                transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+                transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+            # Raise the rekey thresholds (default 512MB / ~2**29 packets) so
+            # large script uploads never stall mid-transfer on a key exchange
+            transport.packetizer.REKEY_BYTES = 2**34
+            transport.packetizer.REKEY_PACKETS = 2**31
+        except Exception as e:
+            self.logger.debug(f"Transport tuning skipped: {e}")
+
+    def _prune_host_key(self) -> None:
+        """Drop cached host keys for this firewall after a key mismatch.
+
+        Keeps the pinning useful without bricking the workflow: the next
+        connect() re-learns the new key via the auto-add policy instead of
+        raising BadHostKeyException until the cache file is hand-edited.
+        """
+        host_keys_file = self.device_params.get("alt_key_file")
+        if not host_keys_file:
+            return
+
+        try:
+            host_keys = paramiko.HostKeys(host_keys_file)
+            for hostname in (self.config.ip_address, f"[{self.config.ip_address}]:22"):
+                if hostname in host_keys:
+                    del host_keys[hostname]
+            host_keys.save(host_keys_file)
+            self.logger.info(f"Pruned stale host key for {self.config.ip_address} from {host_keys_file}")
+        except Exception as e:
+            self.logger.warning(
+                f"Could not prune host-key cache {host_keys_file}: {e} - remove the entry by hand"
+            )
+
+    def get_sftp(self) -> paramiko.SFTPClient:
+        """Return a cached SFTP client over the existing transport.
+
+        The client is opened lazily on first use and reused for every
+        subsequent transfer on this connection - one channel open instead of
+        one per file. It is closed together with the connection in
+        disconnect(). Gaia spawns the sftp subsystem through the connecting
+        user's login shell, so this only works for accounts with a POSIX
+        shell - check has_exec_shell() before relying on it.
+
+        Returns:
+            Active SFTP client
+
+        Raises:
+            ConnectionError: If not connected to the firewall
+        """
+        if not self.connection:
+            raise ConnectionError("Not connected to firewall")
+
+        if self._sftp is None or self._sftp.sock.closed:
+            transport = self.connection.remote_conn.get_transport()
+            self._sftp = paramiko.SFTPClient.from_transport(transport)
+            self.logger.debug("Opened SFTP session")
+
+        return self._sftp
+
     def disconnect(self) -> None:
         """Close SSH connection and clean up resources."""
+        connection = self.connection
         try:
-            if self.connection:
-                self.connection.disconnect()
-                self.connection = None
+            if self._sftp is not None:
+                self._sftp.close()
+                self._sftp = None
+
+            if connection:
+                connection.disconnect()
                 self.logger.info(f"Disconnected from {self.config.ip_address}")
 
         except Exception as e:
             self.logger.warning(f"Error during disconnect: {e}")
+            # A failed graceful disconnect can leave the TCP socket
+            # half-open; force it shut so later operations fail fast
+            # instead of stalling until the OS retransmission timeout
+            with contextlib.suppress(Exception):
+                connection.remote_conn.get_transport().sock.shutdown(socket.SHUT_RDWR)
+        finally:
+            self.connection = None
 
     def is_connected(self) -> bool:
         """Check if SSH connection is active.
@@ -147,32 +346,117 @@ class SSHConnectionManager:
             return False
 
         try:
-            # Test connection with a simple command
-            self.connection.send_command("", expect_string=r"[>#]", read_timeout=self.config.read_timeout)
+            # Match the exact cached prompt when one is known: the escaped
+            # literal reduces to a plain substring scan over the buffer,
+            # where the generic [>#] class can false-match mid-output. If
+            # the cached prompt's mode disagrees with the tracked mode the
+            # cache is stale - fall back to the generic class rather than
+            # timing out on a healthy connection.
+            expect = r"[>#]"
+            if self._last_prompt and self._classify_prompt(self._last_prompt) == self.current_mode:
+                expect = re.escape(self._last_prompt.strip())
+            self.connection.send_command("", expect_string=expect, read_timeout=self.config.read_timeout)
             return True
         except Exception:
             return False
 
-    def wait_for_reconnect(self, max_attempts: int = 30, delay: int = 10) -> bool:
+    def _wait_for_port(self, timeout: float, retry_interval: float = 0.25) -> bool:
+        """Block until the firewall's SSH port accepts TCP connections.
+
+        Issues a non-blocking connect and parks on a selector, so the kernel
+        wakes us the instant the SYN-ACK arrives instead of at some coarse
+        sleep granularity. Refused connections (host answering but sshd not
+        up yet) are retried every retry_interval seconds. Still orders of
+        magnitude cheaper than a full SSH handshake attempt against a host
+        that is mid-reboot.
+
+        Args:
+            timeout: Maximum seconds to wait for the port
+            retry_interval: Pause between attempts after a refusal
+
+        Returns:
+            True if the port accepted a connection within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            try:
+                if sock.connect_ex((self.config.ip_address, 22)) == 0:
+                    return True
+                with selectors.DefaultSelector() as sel:
+                    sel.register(sock, selectors.EVENT_WRITE)
+                    if not sel.select(timeout=min(remaining, 10.0)):
+                        continue  # SYN unanswered - re-issue the connect
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    return True
+            except OSError:
+                pass
+            finally:
+                sock.close()
+
+            time.sleep(retry_interval)
+
+    def wait_for_reconnect(
+        self,
+        max_attempts: int = 30,
+        delay: float = 2.0,
+        cap: float = 30.0,
+        max_total: float = 600.0,
+    ) -> bool:
         """Wait for SSH to become available after reboot.
 
+        Uses exponential backoff with jitter between attempts: the delay
+        starts small so a fast-booting firewall is caught quickly, then grows
+        towards the cap so a slow one is not hammered with expensive TCP/SSH
+        handshake attempts. Gives up when either the attempt count or the
+        total wall-clock budget runs out, so a dead firewall cannot hold the
+        caller indefinitely.
+
         Args:
             max_attempts: Maximum number of connection attempts
-            delay: Delay between attempts in seconds
+            delay: Initial delay between attempts in seconds
+            cap: Ceiling on the per-attempt backoff delay in seconds
+            max_total: Total wall-clock budget for all attempts in seconds
 
         Returns:
             True if reconnection successful, False otherwise
         """
         self.logger.info(f"Waiting for {self.config.ip_address} to become available after reboot")
 
+        deadline = time.monotonic() + max_total
+
         for attempt in range(max_attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.logger.error(f"Reconnect budget of {max_total}s exhausted after {attempt} attempts")
+                return False
+
             self.logger.debug(f"Reconnection attempt {attempt + 1}/{max_attempts}")
 
-            if self.connect():
+            # Park on the port until it answers (kernel wakes us on the
+            # SYN-ACK) before paying for a full SSH handshake
+            attempt_start = time.monotonic()
+            wait = min(delay + random.uniform(0, delay * 0.25), remaining)
+            if self._wait_for_port(wait) and self.connect():
                 self.logger.info("Reconnection successful")
                 return True
 
-            time.sleep(delay)
+            # Make sure the full jittered backoff elapses before the next
+            # handshake: mid-boot the port often accepts TCP long before
+            # sshd can authenticate, and _wait_for_port returns immediately
+            # then - without this sleep the attempts would hammer the
+            # firewall back to back
+            elapsed = time.monotonic() - attempt_start
+            if elapsed < wait:
+                time.sleep(min(wait - elapsed, max(deadline - time.monotonic(), 0)))
+
+            # Exponential backoff with jitter, capped
+            delay = min(delay * 1.7, cap)
 
         self.logger.error(f"Failed to reconnect after {max_attempts} attempts")
         return False
@@ -187,6 +471,25 @@ class SSHConnectionManager:
         """Context manager exit."""
         self.disconnect()
 
+    def _classify_prompt(self, prompt: str) -> FirewallMode:
+        """Classify a prompt string into a firewall mode.
+
+        Pure string matching against the precompiled prompt patterns - no
+        network traffic, so callers that already hold a prompt (or any output
+        ending in one) can recover the mode for free.
+
+        Args:
+            prompt: Prompt text to classify
+
+        Returns:
+            Firewall mode the prompt belongs to
+        """
+        if EXPERT_PROMPT_RE.search(prompt):
+            return FirewallMode.EXPERT
+        if CLISH_PROMPT_RE.search(prompt):
+            return FirewallMode.CLISH
+        return FirewallMode.UNKNOWN
+
     def _detect_current_mode(self) -> FirewallMode:
         """Detect current firewall mode using netmiko's find_prompt method.
 
@@ -197,34 +500,38 @@ class SSHConnectionManager:
             return FirewallMode.UNKNOWN
 
         try:
-            # Get current prompt using netmiko
+            # Get current prompt using netmiko and cache it for callers that
+            # only need the last-seen prompt
             prompt = self.connection.find_prompt()
+            self._last_prompt = prompt
 
-            # Analyze prompt to determine mode
             self.logger.debug(f"Analyzing prompt: '{prompt}'")
-
-            if "[Expert@" in prompt and "]#" in prompt:
-                self.logger.debug("Detected expert mode")
-                return FirewallMode.EXPERT
-            elif ">" in prompt:
-                self.logger.debug("Detected clish mode")
-                return FirewallMode.CLISH
-            else:
-                self.logger.debug(f"Unknown mode for prompt: '{prompt}'")
-                return FirewallMode.UNKNOWN
+            mode = self._classify_prompt(prompt)
+            self.logger.debug(f"Detected mode: {mode.value}")
+            return mode
 
         except Exception as e:
             self.logger.debug(f"Error detecting mode: {e}")
             return FirewallMode.UNKNOWN
 
-    def get_current_mode(self) -> FirewallMode:
+    def get_current_mode(self, refresh: bool = False) -> FirewallMode:
         """Get current firewall mode.
 
+        Returns the locally tracked mode, which is set during connect() and
+        kept up to date by enter_expert_mode/exit_expert_mode - no network
+        probe on the normal path. Pass refresh=True to force re-detection
+        from the live prompt, e.g. after driving the channel directly with
+        commands that may have switched modes.
+
+        Args:
+            refresh: Re-detect the mode from the firewall instead of trusting
+                the cached value
+
         Returns:
             Current firewall mode
         """
-        # Refresh mode detection
-        self.current_mode = self._detect_current_mode()
+        if refresh or self.current_mode == FirewallMode.UNKNOWN:
+            self.current_mode = self._detect_current_mode()
         return self.current_mode
 
     def wait_for_prompt(self, expected_prompt: str, timeout: Optional[int] = None) -> bool:
@@ -248,6 +555,259 @@ class SSHConnectionManager:
             self.logger.debug(f"Timeout waiting for prompt '{expected_prompt}': {e}")
             return False
 
+    def read_until_idle(self, idle_time: float = 0.15, max_wait: float = 5.0) -> str:
+        """Drain channel output until it goes quiet or the deadline passes.
+
+        Returns once no new data has arrived for idle_time seconds - for
+        command sequences with no reliable prompt to wait on, this replaces
+        fixed sleeps with a wait proportional to how long the device
+        actually takes. Between reads the wait blocks on channel readability
+        via a selector, so fresh data wakes the loop immediately instead of
+        on the next poll tick.
+
+        Args:
+            idle_time: Seconds of silence that count as "done"
+            max_wait: Hard ceiling on the total wait in seconds
+
+        Returns:
+            Everything read from the channel
+
+        Raises:
+            ConnectionError: If not connected to firewall
+        """
+        if not self.connection:
+            raise ConnectionError("Not connected to firewall")
+
+        chunks = []
+        deadline = time.monotonic() + max_wait
+        last_data = time.monotonic()
+
+        with selectors.DefaultSelector() as sel:
+            try:
+                # paramiko's Channel exposes a fileno that becomes readable
+                # when decrypted data is buffered
+                sel.register(self.connection.remote_conn, selectors.EVENT_READ)
+                can_wait = True
+            except Exception:
+                can_wait = False
+
+            while time.monotonic() < deadline:
+                chunk = self.connection.read_channel()
+                if chunk:
+                    chunks.append(chunk)
+                    last_data = time.monotonic()
+                    continue
+
+                remaining_idle = idle_time - (time.monotonic() - last_data)
+                if remaining_idle <= 0:
+                    break
+                if can_wait:
+                    sel.select(timeout=min(remaining_idle, deadline - time.monotonic()))
+                else:
+                    time.sleep(0.01)
+
+        return "".join(chunks)
+
+    def run_dialog(self, steps: Sequence[Tuple[Optional[str], str]], read_timeout: Optional[int] = None) -> str:
+        """Drive an interactive prompt dialog over the channel.
+
+        Each step is a (payload, expect_pattern) pair: the payload is written
+        to the channel (skipped when None), then output is read until the
+        expect pattern matches. Replaces sleep-separated write/read sequences
+        with an event-driven loop that advances as soon as each prompt
+        appears.
+
+        Args:
+            steps: Sequence of (payload or None, expect regex) tuples
+            read_timeout: Per-step timeout in seconds (uses config.read_timeout if None)
+
+        Returns:
+            Full transcript of the dialog output
+
+        Raises:
+            ConnectionError: If not connected to firewall
+        """
+        if not self.connection:
+            raise ConnectionError("Not connected to firewall")
+
+        timeout = read_timeout or self.config.read_timeout
+        chunks = []
+
+        for payload, expect_pattern in steps:
+            if payload is not None:
+                if _MODE_CHANGING_RE.search(payload):
+                    self.current_mode = FirewallMode.UNKNOWN
+                self.connection.write_channel(payload)
+            chunks.append(self.connection.read_until_pattern(pattern=expect_pattern, read_timeout=timeout))
+
+        return "".join(chunks)
+
+    def execute_commands_batch(self, commands: Sequence[str], read_timeout: Optional[int] = None) -> List[str]:
+        """Execute several commands with a single pipelined channel write.
+
+        All commands are sent in one write so they are in flight together;
+        the shell processes them sequentially and the outputs are split back
+        per command by reading up to the prompt N times. N commands cost one
+        send and a streamed read instead of N separate round trips.
+
+        Only for non-interactive commands that leave the prompt unchanged -
+        do not batch commands like 'expert' or 'exit' that switch modes or
+        ask questions.
+
+        Args:
+            commands: Commands to execute in order
+            read_timeout: Per-command read timeout in seconds (uses config.timeout if None)
+
+        Returns:
+            List of output strings, one per command
+
+        Raises:
+            ConnectionError: If not connected to firewall
+        """
+        if not self.connection:
+            raise ConnectionError("Not connected to firewall")
+
+        timeout = read_timeout or self.config.timeout
+
+        # The current prompt delimits each command's output in the transcript
+        prompt = re.escape(self.connection.find_prompt().strip())
+
+        self.logger.debug(f"Executing batch of {len(commands)} commands")
+        if any(_MODE_CHANGING_RE.search(cmd) for cmd in commands):
+            self.current_mode = FirewallMode.UNKNOWN
+        self.connection.write_channel("".join(f"{cmd}\n" for cmd in commands))
+
+        outputs = []
+        for cmd in commands:
+            output = self.connection.read_until_pattern(pattern=prompt, read_timeout=timeout)
+            self.logger.debug("Batch command '%s' output: %s", cmd, output)
+            outputs.append(output)
+
+        return outputs
+
+    def exec_script(
+        self,
+        script: str,
+        timeout: Optional[int] = None,
+        output_sink: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[int, str]:
+        """Run a non-interactive shell script over a dedicated exec channel.
+
+        Opens a new session channel on the already-established transport
+        (cheap - no re-handshake) and runs the script via exec_command,
+        so no prompt parsing or interactive round-trips are needed.
+
+        When an output_sink is given, stdout is streamed to it chunk by
+        chunk as it arrives and only a bounded tail is kept for the return
+        value - peak memory stays O(chunk) instead of O(output) for scripts
+        that emit a lot of progress output.
+
+        Args:
+            script: Shell script/command string to execute
+            timeout: Channel timeout in seconds (uses config.timeout if None)
+            output_sink: Optional callable receiving stdout chunks as they arrive
+
+        Returns:
+            Tuple of (exit_status, combined stdout+stderr output; with an
+            output_sink only the last ~4MB of stdout is included)
+        """
+        if not self.connection:
+            raise ConnectionError("Not connected to firewall")
+
+        self.logger.debug(f"Executing script over exec channel: {script}")
+
+        transport = self.connection.remote_conn.get_transport()
+        channel = transport.open_session()
+        try:
+            channel.settimeout(timeout or self.config.timeout)
+            channel.exec_command(script)
+            stdout_stream = channel.makefile("rb")
+            if output_sink is None:
+                stdout = stdout_stream.read().decode("utf-8", errors="ignore")
+            else:
+                # Ring buffer of recent chunks: enough trailing context for
+                # success/failure checks without holding the full output
+                tail: deque = deque(maxlen=64)
+                while True:
+                    chunk = stdout_stream.read(65536)
+                    if not chunk:
+                        break
+                    text = chunk.decode("utf-8", errors="ignore")
+                    output_sink(text)
+                    tail.append(text)
+                stdout = "".join(tail)
+            stderr = channel.makefile_stderr("rb").read().decode("utf-8", errors="ignore")
+            exit_status = channel.recv_exit_status()
+        finally:
+            channel.close()
+
+        self.logger.debug(f"Exec channel exit status: {exit_status}")
+        return exit_status, stdout + stderr
+
+    def has_exec_shell(self) -> bool:
+        """Whether exec channels run under a POSIX shell for this user.
+
+        Gaia spawns exec requests (and the sftp subsystem) through the
+        connecting user's login shell, and for a stock admin account that
+        shell is clish - shell scripts fed to exec_script fail there with a
+        CLINFR error instead of running. Probed once per connection with a
+        cheap echo and cached; clish has no echo builtin, so the probe
+        cleanly separates the two cases.
+
+        Returns:
+            True if exec_script can run shell commands on this connection
+        """
+        if self._exec_shell is None:
+            try:
+                exit_status, output = self.exec_script(
+                    "echo __SHELL_PROBE__", timeout=self.config.read_timeout
+                )
+                self._exec_shell = exit_status == 0 and "__SHELL_PROBE__" in output
+            except Exception as e:
+                self.logger.debug(f"Exec shell probe failed: {e}")
+                self._exec_shell = False
+            self.logger.debug(f"Exec shell available: {self._exec_shell}")
+        return self._exec_shell
+
+    def run_shell(self, command: str, timeout: Optional[int] = None) -> Tuple[int, str]:
+        """Run a shell command, preferring a dedicated exec channel.
+
+        Uses exec_script when the login shell can run it; otherwise falls
+        back to the interactive channel in expert mode - the working path on
+        stock Gaia, where the admin login shell is clish. The fallback wraps
+        the command in bash -c so set -e and exit-status semantics match the
+        exec channel, enters and leaves expert mode as needed, and recovers
+        the exit status from a remotely expanded RC:$? marker.
+
+        Args:
+            command: Shell command string to execute
+            timeout: Timeout in seconds (uses config.timeout if None)
+
+        Returns:
+            Tuple of (exit_status, output); exit status -1 if it could not
+            be determined
+        """
+        if self.has_exec_shell():
+            return self.exec_script(command, timeout=timeout)
+
+        entered = False
+        if self.get_current_mode() != FirewallMode.EXPERT:
+            if not self.enter_expert_mode(self.config.expert_password):
+                return -1, "Could not enter expert mode to run shell command"
+            entered = True
+
+        try:
+            output = self.connection.send_command(
+                f"bash -c {shlex.quote(command)}; echo RC:$?",
+                read_timeout=timeout or self.config.timeout,
+            )
+        finally:
+            if entered:
+                self.exit_expert_mode()
+
+        match = RC_MARKER_RE.search(output)
+        return (int(match.group(1)) if match else -1), output
+
     def enter_expert_mode(self, expert_password: str) -> bool:
         """Enter expert mode using netmiko's send_command_timing.
 
@@ -271,25 +831,42 @@ class SSHConnectionManager:
             # Send expert command and wait for password prompt
             self.logger.debug("Sending expert command")
             output = self.connection.send_command_timing("expert")
-            self.logger.debug(f"Expert command output: {output}")
+            self.logger.debug("Expert command output: %s", output)
 
-            # Check if password prompt appeared
-            if "enter expert password:" in output.lower():
+            # Check if password prompt appeared - compiled scan, no
+            # full-transcript lowercased copy
+            if EXPERT_PW_PROMPT_RE.search(output):
                 # Send password directly using write_channel (no waiting)
                 self.logger.debug("Sending expert password")
                 self.connection.write_channel(expert_password + "\n")
 
-                # Give it time to process the full expert mode output
-                time.sleep(1)
-
-                # Read the output to see what happened
-                expert_output = self.connection.send_command_timing("")
-                self.logger.debug(f"Expert mode output: {expert_output}")
+                # Wait for the expert prompt instead of sleeping - returns as
+                # soon as the prompt appears rather than after a fixed second
+                expert_output = ""
+                try:
+                    expert_output = self.connection.read_until_pattern(
+                        pattern=r"\[Expert@[^\]]+\]#", read_timeout=self.config.read_timeout
+                    )
+                    self.logger.debug("Expert mode output: %s", expert_output)
+                except Exception as e:
+                    self.logger.debug(f"Expert prompt not seen after password: {e}")
 
                 self.logger.debug("Password sent successfully")
 
-                # Verify we're in expert mode
-                if self._detect_current_mode() == FirewallMode.EXPERT:
+                # Verify from the output already read - the new prompt arrived
+                # in the same buffer as the password response, so no extra
+                # round trip unless that read failed
+                new_mode = self._classify_prompt(expert_output)
+                if new_mode == FirewallMode.UNKNOWN:
+                    new_mode = self._detect_current_mode()
+
+                if new_mode == FirewallMode.EXPERT:
+                    self.current_mode = FirewallMode.EXPERT
+                    # Keep the cached prompt in sync for is_connected's
+                    # literal match - the new prompt is the last line of the
+                    # output already read
+                    if expert_output.strip():
+                        self._last_prompt = expert_output.strip().splitlines()[-1].strip()
                     self.logger.info("Successfully entered expert mode")
                     return True
                 else:
@@ -327,12 +904,23 @@ class SSHConnectionManager:
 
         try:
             # Send exit command using netmiko
-            self.connection.send_command_timing(
+            output = self.connection.send_command_timing(
                 "exit", last_read=self.config.last_read, read_timeout=self.config.read_timeout
             )
 
-            # Verify we're back in clish mode
-            if self._detect_current_mode() == FirewallMode.CLISH:
+            # Verify from the exit output itself - the clish prompt comes
+            # back in the same read, so an extra probe is only needed when
+            # that output is inconclusive
+            new_mode = self._classify_prompt(output)
+            if new_mode == FirewallMode.UNKNOWN:
+                new_mode = self._detect_current_mode()
+
+            if new_mode == FirewallMode.CLISH:
+                self.current_mode = FirewallMode.CLISH
+                # Keep the cached prompt in sync for is_connected's literal
+                # match - the clish prompt came back in the same read
+                if output.strip():
+                    self._last_prompt = output.strip().splitlines()[-1].strip()
                 self.logger.info("Successfully exited expert mode to clish")
                 return True
             else:
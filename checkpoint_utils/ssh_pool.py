@@ -0,0 +1,95 @@
+"""Shared SSH connection pool for Check Point firewalls."""
+
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from .config import FirewallConfig
+from .ssh_connection import SSHConnectionManager
+
+
+class SSHConnectionPool:
+    """Process-wide pool of live SSHConnectionManager instances.
+
+    Connections are keyed by (ip_address, username) so back-to-back tasks
+    against the same firewall reuse one authenticated connection instead of
+    paying a full TCP + key-exchange + auth handshake per task.
+    """
+
+    def __init__(self):
+        """Initialize an empty pool."""
+        self._lock = threading.Lock()
+        self._managers: Dict[Tuple[str, str], SSHConnectionManager] = {}
+
+    @contextmanager
+    def acquire(self, config: FirewallConfig):
+        """Lease a connected manager for the given firewall config.
+
+        Reuses a cached live connection when one exists for the same
+        (ip_address, username); otherwise connects a fresh manager. The
+        connection is returned to the pool on exit rather than closed.
+
+        Args:
+            config: Firewall configuration with connection details
+
+        Yields:
+            Connected SSHConnectionManager
+
+        Raises:
+            ConnectionError: If a fresh connection cannot be established
+        """
+        manager = self._get_or_connect(config)
+        try:
+            yield manager
+        finally:
+            self.release(manager)
+
+    def _get_or_connect(self, config: FirewallConfig) -> SSHConnectionManager:
+        """Return a cached live manager or connect a new one."""
+        key = (config.ip_address, config.username)
+
+        with self._lock:
+            manager = self._managers.pop(key, None)
+
+        if manager is not None:
+            if manager.is_connected():
+                manager.logger.debug("Reusing pooled SSH connection")
+                return manager
+            # Stale connection - discard and reconnect below
+            manager.disconnect()
+
+        manager = SSHConnectionManager(config)
+        if not manager.connect():
+            raise ConnectionError(f"Failed to connect to {config.ip_address}")
+        return manager
+
+    def release(self, manager: SSHConnectionManager) -> None:
+        """Return a manager to the pool for later reuse.
+
+        If two threads leased connections for the same firewall, the slot
+        may already hold another manager when the second one comes back -
+        the displaced connection is disconnected rather than leaked until
+        process exit.
+        """
+        key = (manager.config.ip_address, manager.config.username)
+        with self._lock:
+            displaced = self._managers.get(key)
+            self._managers[key] = manager
+
+        if displaced is not None and displaced is not manager:
+            displaced.disconnect()
+
+    def close_all(self) -> None:
+        """Disconnect and drop every pooled connection."""
+        with self._lock:
+            managers = list(self._managers.values())
+            self._managers.clear()
+
+        for manager in managers:
+            manager.disconnect()
+
+
+# Default process-wide pool, closed automatically at interpreter exit
+pool = SSHConnectionPool()
+atexit.register(pool.close_all)
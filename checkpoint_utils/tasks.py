@@ -5,39 +5,113 @@ Simplified functions for common CheckPoint firewall management operations.
 """
 
 import logging
-import traceback
+import re
+import shlex
+from functools import lru_cache
+from typing import Optional
 
 from .command_executor import FirewallMode
 from .config import FirewallConfig
 from .expert_password import ExpertPasswordManager
-from .ssh_connection import SSHConnectionManager
+from .ssh_pool import SSHConnectionPool
+from .ssh_pool import pool as default_pool
 from .user_management import UserManager
 
 logger = logging.getLogger(__name__)
 
+# Banner separators, built once at import instead of re-multiplied per print
+_EQ60 = "=" * 60
+
+# Vagrant insecure SSH public key - module-level so the multi-line literal is
+# built once at import instead of on every task invocation
+VAGRANT_PUBLIC_KEY = (
+    "ssh-rsa AAAAB3NzaC1yc2EAAAABIwAAAQEA6NF8iallvQVp22WDkTkyrtvp9eWW6A8YVr+kz4TjGYe7gHzIw"
+    "+niNltGEFHzD8+v1I2YJ6oXevct1YeS0o9HZyN1Q9qgCgzUFtdOKLv6IedplqoPkcmF0aYet2PkEFHzD8+v1I2YJ6oX"
+    "evct1YeS0o9HZyN1Q9qgCgzUFtdOKLv6IedplqoPkcmF0aYet2PkEDo3MlTBckFXPITAMzF8dJSIFo9D8HfdOV0IAdx4"
+    "O7PtixWKn5y2hMNG0zQPyUecp4pzC6kivAIhyfHilFR61RGL+GPXQ2MWZWFYbAGjyiYJnAmCP3NOTd0jMZEnDkbUvxhM"
+    "mBYSdETk1rRgm+R4LOzFUGaHqHDLKLX+FIPKcF96hrucXzcWyLbIbEgE98OHlnVYCzRdK8jlqm8tehUc9c9WhQ== "
+    "vagrant insecure public key"
+)
+
+
+@lru_cache(maxsize=8)
+def _user_clish_commands(username: str) -> tuple:
+    """Render the clish command sequence that creates a user.
+
+    Cached per username so repeated runs (bulk fan-out, retries) reuse the
+    already-built strings instead of re-interpolating them every call.
+    """
+    return (
+        "set password-controls complexity 1",
+        f"add user {username} uid 2000 homedir /home/{username}",
+        f"add rba user {username} roles adminRole",
+        f"set user {username} shell /bin/bash",
+        "save config",
+    )
+
+
+# Human-readable names for the SSH key setup steps, indexed by the
+# __STEP_<n>__ markers the script echoes before each one
+_SSH_KEY_STEP_NAMES = (
+    "creating .ssh directory",
+    "writing authorized_keys",
+    "setting key permissions",
+    "setting key ownership",
+)
+_STEP_MARKER_RE = re.compile(r"__STEP_(\d+)__")
+
+
+@lru_cache(maxsize=8)
+def _ssh_key_script(username: str) -> str:
+    """Render the shell script that installs the vagrant public key.
+
+    The whole sequence runs in one round trip under set -e (via run_shell,
+    which picks an exec channel or the expert-mode fallback); each step
+    echoes a __STEP_<n>__ marker first, so a failure can be attributed to
+    the exact step from the transcript without splitting the script back
+    into separate commands. The user's primary group is resolved with
+    id -gn rather than assuming 'users', which does not exist on every
+    Gaia build. Cached per username like _user_clish_commands.
+    """
+    steps = (
+        f'install -d -m 700 -o {username} -g "$grp" /home/{username}/.ssh',
+        f"printf '%s\\n' {shlex.quote(VAGRANT_PUBLIC_KEY)} > /home/{username}/.ssh/authorized_keys",
+        f"chmod 600 /home/{username}/.ssh/authorized_keys",
+        f'chown {username}:"$grp" /home/{username}/.ssh/authorized_keys',
+    )
+    return (
+        "set -e; "
+        f"grp=$(id -gn {username}); "
+        + "; ".join(f"echo __STEP_{i}__; {cmd}" for i, cmd in enumerate(steps))
+    )
+
+
 # =============================================================================
 # TASK FUNCTIONS
 # =============================================================================
 
 
-def task_set_expert_password(config: FirewallConfig) -> bool:
+def task_set_expert_password(config: FirewallConfig, pool: Optional[SSHConnectionPool] = None) -> bool:
     """
     Task: Set up expert password on the firewall.
 
     Args:
         config: Firewall configuration including expert password
+        pool: Connection pool to lease from (default: the shared process pool)
 
     Returns:
         True if task completed successfully, False otherwise
     """
-    print("\n" + "=" * 60)
+    pool = pool or default_pool
+    print("\n" + _EQ60)
     print("🔐 Task 1: Expert Password Setup")
-    print("=" * 60)
+    print(_EQ60)
 
     try:
-        # Use context manager pattern like fw_set_expert.py
+        # Lease from the shared pool - back-to-back tasks against the same
+        # firewall reuse one authenticated connection
         print(f" □ Connecting to firewall at {config.ip_address}...")
-        with SSHConnectionManager(config) as ssh_manager:
+        with pool.acquire(config) as ssh_manager:
             print("   ✓ Connected successfully")
 
             # Detect initial mode
@@ -60,11 +134,16 @@ def task_set_expert_password(config: FirewallConfig) -> bool:
 
     except Exception as e:
         print(f"\n✗ Task 1: Expert Password Setup failed with exception: {e}")
-        traceback.print_exc()
+        logger.exception("Expert password setup task failed")
         return False
 
 
-def task_create_vagrant_user(config: FirewallConfig, username: str = "vagrant", password: str = "vagrant") -> bool:
+def task_create_vagrant_user(
+    config: FirewallConfig,
+    username: str = "vagrant",
+    password: str = "vagrant",
+    pool: Optional[SSHConnectionPool] = None,
+) -> bool:
     """
     Task: Configure vagrant user with SSH access on the firewall.
     Uses the same clean pattern as expert password setup.
@@ -73,30 +152,22 @@ def task_create_vagrant_user(config: FirewallConfig, username: str = "vagrant",
         config: Firewall configuration including expert password
         username: Username to create (default: vagrant)
         password: Password to set (default: vagrant)
+        pool: Connection pool to lease from (default: the shared process pool)
 
     Returns:
         True if task completed successfully, False otherwise
     """
-    print("\n" + "=" * 60)
+    pool = pool or default_pool
+    print("\n" + _EQ60)
     print("👤 Task 2: Vagrant User Setup")
-    print("=" * 60)
+    print(_EQ60)
     print(f"Creating user: {username}")
     print(f"Password: {'*' * len(password)}")
 
-    # Vagrant insecure SSH public key
-    vagrant_public_key = (
-        "ssh-rsa AAAAB3NzaC1yc2EAAAABIwAAAQEA6NF8iallvQVp22WDkTkyrtvp9eWW6A8YVr+kz4TjGYe7gHzIw"
-        "+niNltGEFHzD8+v1I2YJ6oXevct1YeS0o9HZyN1Q9qgCgzUFtdOKLv6IedplqoPkcmF0aYet2PkEFHzD8+v1I2YJ6oX"
-        "evct1YeS0o9HZyN1Q9qgCgzUFtdOKLv6IedplqoPkcmF0aYet2PkEDo3MlTBckFXPITAMzF8dJSIFo9D8HfdOV0IAdx4"
-        "O7PtixWKn5y2hMNG0zQPyUecp4pzC6kivAIhyfHilFR61RGL+GPXQ2MWZWFYbAGjyiYJnAmCP3NOTd0jMZEnDkbUvxhM"
-        "mBYSdETk1rRgm+R4LOzFUGaHqHDLKLX+FIPKcF96hrucXzcWyLbIbEgE98OHlnVYCzRdK8jlqm8tehUc9c9WhQ== "
-        "vagrant insecure public key"
-    )
-
     try:
-        # Use context manager pattern like expert password task
+        # Lease from the shared pool like the expert password task
         print(f"\n □ Connecting to firewall at {config.ip_address}...")
-        with SSHConnectionManager(config) as ssh_manager:
+        with pool.acquire(config) as ssh_manager:
             print("   ✓ Connected successfully")
 
             # Ensure we're in clish mode for user operations
@@ -141,25 +212,24 @@ def task_create_vagrant_user(config: FirewallConfig, username: str = "vagrant",
             # Step 3: Configure new user in clish mode
             print(f"\n □ Creating {username} user in clish mode...")
 
-            clish_commands = [
-                "set password-controls complexity 1",
-                f"add user {username} uid 2000 homedir /home/{username}",
-                f"add rba user {username} roles adminRole",
-                f"set user {username} shell /bin/bash",
-                "save config",
-            ]
-
-            for cmd in clish_commands:
-                print(f"   Executing: {cmd}")
-                try:
-                    output = ssh_manager.connection.send_command_timing(
-                        cmd, read_timeout=config.timeout, last_read=config.last_read
-                    )
-                    print("   ✓ Command successful")
-                except Exception as e:
+            clish_commands = _user_clish_commands(username)
+
+            # Pipeline the whole sequence in one channel write - one send and
+            # a streamed read instead of a prompt round trip per command
+            print(f"   Executing {len(clish_commands)} commands as one batch")
+            try:
+                outputs = ssh_manager.execute_commands_batch(clish_commands, read_timeout=config.timeout)
+            except Exception as e:
+                print("   ✗ Batched command execution failed")
+                print(f"     Error: {str(e)}")
+                return False
+
+            for cmd, output in zip(clish_commands, outputs):
+                if "CLINFR" in output or "NMSFWD" in output:
                     print(f"   ✗ Command failed: {cmd}")
-                    print(f"     Error: {str(e)}")
+                    print(f"     Output: {output.strip()}")
                     return False
+                print(f"   ✓ {cmd}")
 
             # Set user password using UserManager
             print(f"\n □ Setting {username} user password...")
@@ -168,70 +238,40 @@ def task_create_vagrant_user(config: FirewallConfig, username: str = "vagrant",
                 return False
             print(f"   ✓ Password set for {username} user")
 
-            # Configure SSH keys in expert mode
-            print("\n □ Setting up SSH keys in expert mode...")
-            if not ssh_manager.enter_expert_mode(config.expert_password):
-                print("   ✗ Failed to enter expert mode")
-                return False
-            print("   ✓ Entered expert mode successfully")
-
-            # Create SSH directory and set up keys using working patterns
-            print(f"   Creating SSH directory for {username}...")
-            try:
-                output = ssh_manager.connection.send_command(
-                    f"mkdir -p /home/{username}/.ssh", read_timeout=config.timeout
-                )
-                print("   ✓ SSH directory created")
-            except Exception as e:
-                print(f"   ✗ Failed to create SSH directory: {str(e)}")
-                return False
-
-            # Set up SSH key using UserManager
-            print("   Installing SSH public key...")
-            if not user_mgr.setup_ssh_key(username, vagrant_public_key):
-                print("   ✗ Failed to setup SSH key")
+            # Configure SSH keys as one shell script - a single exec round
+            # trip where the login shell allows it, or the interactive
+            # expert-mode fallback on stock Gaia admin accounts whose login
+            # shell is clish
+            print("\n □ Setting up SSH keys (single shell script)...")
+            exit_status, output = ssh_manager.run_shell(_ssh_key_script(username))
+            if exit_status != 0:
+                # The last step marker in the transcript names the step that
+                # set -e aborted on
+                markers = _STEP_MARKER_RE.findall(output)
+                failed_step = _SSH_KEY_STEP_NAMES[int(markers[-1])] if markers else "startup"
+                print(f"   ✗ SSH key setup failed while {failed_step} (exit {exit_status}): {output.strip()}")
                 return False
-            print("   ✓ SSH key installed")
-
-            # Set permissions and ownership
-            permission_commands = [
-                f"chmod 700 /home/{username}/.ssh",
-                f"chmod 600 /home/{username}/.ssh/authorized_keys",
-                f"chown -R {username}:users /home/{username}/.ssh",
-            ]
-
-            for cmd in permission_commands:
-                print(f"   Executing: {cmd}")
-                try:
-                    output = ssh_manager.connection.send_command(cmd, read_timeout=config.timeout)
-                    print("   ✓ Command successful")
-                except Exception as e:
-                    print(f"   ✗ Command failed: {cmd}")
-                    print(f"     Error: {str(e)}")
-                    return False
+            print("   ✓ SSH directory, key and permissions configured")
 
-            # Verify setup
+            # Verify setup - both checks ride one shell round trip; a ---
+            # separator splits the combined output back into sections, and
+            # errors are detected from section content since the compound
+            # command's exit status only reflects the last part
             print(f"\n □ Verifying {username} user setup...")
+            exit_status, output = ssh_manager.run_shell(
+                f"grep {username} /etc/passwd; echo ---; ls -la /home/{username}/.ssh/"
+            )
+            passwd_entry, _, ssh_dir_listing = output.partition("---")
 
-            # Check user exists
-            try:
-                output = ssh_manager.connection.send_command(
-                    f"grep {username} /etc/passwd", read_timeout=config.timeout
-                )
-                print(f"   ✓ User entry: {output.strip()}")
-            except Exception:
+            if username not in passwd_entry:
                 print(f"   ✗ {username} user not found in /etc/passwd")
                 return False
+            print(f"   ✓ User entry: {passwd_entry.strip()}")
 
-            # Check SSH directory
-            try:
-                output = ssh_manager.connection.send_command(
-                    f"ls -la /home/{username}/.ssh/", read_timeout=config.timeout
-                )
-                print("   ✓ SSH directory contents verified")
-            except Exception:
+            if "authorized_keys" not in ssh_dir_listing:
                 print("   ✗ SSH directory not accessible")
                 return False
+            print("   ✓ SSH directory contents verified")
 
             print(f"\n=== Task 2: {username.title()} User Setup Successful! ===")
             print(f"You can now SSH using the password or the private key: {username}@{config.ip_address}")
@@ -239,7 +279,7 @@ def task_create_vagrant_user(config: FirewallConfig, username: str = "vagrant",
 
     except Exception as e:
         print(f"\n✗ Task 2: Vagrant User Setup failed with exception: {e}")
-        traceback.print_exc()
+        logger.exception("Vagrant user setup task failed")
         return False
 
 
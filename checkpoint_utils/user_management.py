@@ -5,8 +5,8 @@ Handles user creation, password setting, and SSH key configuration.
 """
 
 import logging
-import time
 
+from .prompts import ERROR_RE, PASSWORD_PROMPT_RE
 from .ssh_connection import SSHConnectionManager
 
 logger = logging.getLogger(__name__)
@@ -44,32 +44,26 @@ class UserManager:
         try:
             self.logger.debug(f"Setting password for user: {username}")
 
-            # Use write_channel approach that works reliably
-            self.ssh.connection.write_channel(f"set user {username} password\n")
-            time.sleep(1)
-
-            # Read initial output
-            output = self.ssh.connection.read_channel()
-            self.logger.debug(f"Password prompt output: {output}")
+            # Drive the prompt dialog instead of sleeping: wait for whichever
+            # prompt the command produces, then send each secret the moment
+            # its prompt appears
+            output = self.ssh.run_dialog([(f"set user {username} password\n", r"(?i)password:|[>#]\s*$")])
+            self.logger.debug("Password prompt output: %s", output)
 
             # Check for password prompt
-            if "new password:" in output.lower() or "password:" in output.lower():
-                # Send first password
-                self.ssh.connection.write_channel(f"{password}\n")
-                time.sleep(1)
-
-                # Send confirmation password
-                self.ssh.connection.write_channel(f"{password}\n")
-                time.sleep(2)
-
-                # Read final result
-                final_output = self.ssh.connection.read_channel()
-                self.logger.debug(f"Password setting result: {final_output}")
+            if PASSWORD_PROMPT_RE.search(output):
+                # Send password and confirmation as soon as each is asked for
+                output += self.ssh.run_dialog(
+                    [
+                        (f"{password}\n", r"(?i)password.*:"),
+                        (f"{password}\n", r"[>#]\s*$"),
+                    ]
+                )
+                self.logger.debug("Password setting result: %s", output)
 
                 # Check for errors
-                combined_output = output + final_output
-                if "error" in combined_output.lower() or "failed" in combined_output.lower():
-                    self.logger.error(f"Error setting password for {username}: {combined_output}")
+                if ERROR_RE.search(output):
+                    self.logger.error(f"Error setting password for {username}: {output}")
                     return False
 
                 self.logger.info(f"Password set successfully for user: {username}")
@@ -96,19 +90,17 @@ class UserManager:
         try:
             self.logger.debug(f"Setting up SSH key for user: {username}")
 
-            # Use heredoc approach that works reliably (from vagrant script)
-            self.ssh.connection.write_channel(f"cat > /home/{username}/.ssh/authorized_keys << 'EOF'\n")
-            time.sleep(0.5)
-            self.ssh.connection.write_channel(f"{public_key}\n")
-            time.sleep(0.5)
-            self.ssh.connection.write_channel("EOF\n")
-            time.sleep(1)
+            # Send the whole heredoc in one write so the server sees it atomically -
+            # no sleeps needed between the cat command, key body and EOF marker
+            self.ssh.connection.write_channel(
+                f"cat > /home/{username}/.ssh/authorized_keys << 'EOF'\n{public_key}\nEOF\n"
+            )
 
-            # Read output to check for errors
-            output = self.ssh.connection.read_channel()
-            self.logger.debug(f"SSH key setup output: {output}")
+            # Wait for the shell prompt to return instead of sleeping
+            output = self.ssh.connection.read_until_pattern(r"[#>$] ?$", read_timeout=3)
+            self.logger.debug("SSH key setup output: %s", output)
 
-            if "error" in output.lower() or "failed" in output.lower():
+            if ERROR_RE.search(output):
                 self.logger.error(f"Error setting up SSH key for {username}: {output}")
                 return False
 
@@ -138,26 +130,30 @@ class UserManager:
             command = f"show user {username}"
             self.logger.debug(f"Executing user check command: {command}")
 
+            config = self.ssh.config
             output = self.ssh.connection.send_command_timing(
                 command,
-                last_read=self.ssh.config.last_read,
-                read_timeout=self.ssh.config.read_timeout,
+                last_read=config.last_read,
+                read_timeout=config.read_timeout,
             )
-            self.logger.debug(f"User check raw output length: {len(output)} chars")
-            self.logger.debug(f"User check output repr: {repr(output)}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("User check raw output length: %d chars", len(output))
+                self.logger.debug("User check output repr: %r", output)
 
             # Check if output contains only the command echo (indicates incomplete response)
             if output.strip().endswith(command):
                 self.logger.warning("Output appears to be just command echo - possibly incomplete response")
                 self.logger.warning(f"Expected to see response data after: '{command}'")
 
-            self.logger.debug(f"User check output: '{output}'")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("User check output: '%s'", output)
 
             # Check if user exists based on output content
             # Look for the user's home directory pattern which indicates user exists
             home_dir_pattern = f"/home/{username}"
-            self.logger.debug(f"##DEBUG## Looking for home directory pattern: '{home_dir_pattern}'")
-            self.logger.debug(f"##DEBUG## in the output:\n{output}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("##DEBUG## Looking for home directory pattern: '%s'", home_dir_pattern)
+                self.logger.debug("##DEBUG## in the output:\n%s", output)
 
             if home_dir_pattern in output:
                 # User exists - found home directory pattern